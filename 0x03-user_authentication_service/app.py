@@ -3,7 +3,7 @@
 """App module."""
 
 import os
-from typing import Tuple
+from typing import Tuple, Union
 
 from flask import Flask, abort, jsonify, redirect, request
 from werkzeug import Response
@@ -15,24 +15,56 @@ AUTH = Auth()
 app = Flask(__name__)
 app.url_map.strict_slashes = False
 
+# Form fields expected in the request body of each endpoint.
+_F_USERS = frozenset(("email", "password"))
+_F_RESET = frozenset(("email",))
+_F_UPDATE = frozenset(("email", "reset_token", "new_password"))
 
-@app.route("/", methods=["GET"])
-def root():
-    """API Root."""
-    return jsonify({"message": "Bienvenue"})
+# The root response never changes, so its body is serialized once.
+_ROOT_BODY = b'{"message":"Bienvenue"}\n'
 
+# (endpoint, method) -> form fields required in the request body.
+_REQUIRED = {
+    ("users", "POST"): _F_USERS,
+    ("login", "POST"): _F_USERS,
+    ("get_reset_password_token", "POST"): _F_RESET,
+    ("update_password", "PUT"): _F_UPDATE,
+}
+
+
+@app.before_request
+def validate_request_body() -> Union[Tuple[Response, int], None]:
+    """Reject requests whose body lacks the fields their endpoint needs."""
+    expected_fields = _REQUIRED.get((request.endpoint, request.method))
+    if expected_fields is None:
+        return None
 
-@app.route("/users", methods=["POST"])
-def users() -> Tuple[Response, int]:
-    """Register new user."""
     success, err_msg = utils.request_body_provided(
-        expected_fields={"email", "password"}
+        expected_fields=expected_fields
     )
     if not success:
         return jsonify({"message": err_msg}), 400
+    return None
+
 
-    email = request.form.get("email")
-    password = request.form.get("password")
+@app.teardown_appcontext
+def remove_db_session(exception=None) -> None:
+    """Release the database session used by the request."""
+    AUTH.remove_db_session()
+
+
+@app.route("/", methods=["GET"])
+def root() -> Response:
+    """API Root."""
+    return app.response_class(_ROOT_BODY, mimetype="application/json")
+
+
+@app.route("/users", methods=["POST"])
+def users() -> Tuple[Response, int]:
+    """Register new user."""
+    form = request.form
+    email = form["email"]
+    password = form["password"]
 
     try:
         AUTH.register_user(email=email, password=password)
@@ -55,14 +87,9 @@ def login() -> Tuple[Response, int]:
 
     Upon successful login, a session is created for the authenticated user.
     """
-    success, err_msg = utils.request_body_provided(
-        expected_fields={"email", "password"}
-    )
-    if not success:
-        return jsonify({"message": err_msg}), 400
-
-    email = request.form.get("email")
-    password = request.form.get("password")
+    form = request.form
+    email = form["email"]
+    password = form["password"]
 
     if not AUTH.valid_login(email=email, password=password):
         abort(401)
@@ -103,11 +130,7 @@ def profile() -> Response:
 @app.route("/reset_password", methods=["POST"])
 def get_reset_password_token() -> Tuple[Response, int]:
     """Get the token for user password reset."""
-    success, err_msg = utils.request_body_provided(expected_fields={"email"})
-    if not success:
-        return jsonify({"message": err_msg}), 400
-
-    email = request.form.get("email")
+    email = request.form["email"]
 
     try:
         reset_token = AUTH.get_reset_password_token(email=email)
@@ -120,15 +143,10 @@ def get_reset_password_token() -> Tuple[Response, int]:
 @app.route("/reset_password", methods=["PUT"])
 def update_password() -> Tuple[Response, int]:
     """Update the user's password."""
-    success, err_msg = utils.request_body_provided(
-        expected_fields={"email", "reset_token", "new_password"}
-    )
-    if not success:
-        return jsonify({"message": err_msg}), 400
-
-    email = request.form.get("email")
-    reset_token = request.form.get("reset_token")
-    new_password = request.form.get("new_password")
+    form = request.form
+    email = form["email"]
+    reset_token = form["reset_token"]
+    new_password = form["new_password"]
 
     try:
         AUTH.update_password(reset_token=reset_token, password=new_password)
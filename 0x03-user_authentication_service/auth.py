@@ -2,9 +2,16 @@
 
 """Auth module."""
 import uuid
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, getenv
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, NamedTuple, Union
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHash, VerificationError
+from cachetools import TTLCache
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound
 
 from db import DB
@@ -12,10 +19,119 @@ from db import DB
 # noinspection PyCompatibility
 from user import User
 
+# Argon2id work factors, tunable per deployment. memory_cost is in KiB and
+# floored at the 19 MiB OWASP minimum for Argon2id.
+_MIN_TIME_COST = 1
+_MIN_MEMORY_COST = 19 * 1024
+_TIME_COST = max(_MIN_TIME_COST, int(getenv("ARGON2_TIME_COST", "2")))
+_MEMORY_COST = max(
+    _MIN_MEMORY_COST, int(getenv("ARGON2_MEMORY_COST", str(64 * 1024)))
+)
+
+
+class _BcryptHasher:
+    """Verify legacy bcrypt password hashes."""
+
+    prefix = "$2"
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a plaintext password against a bcrypt hash."""
+        return bcrypt.checkpw(
+            password=password.encode(),
+            hashed_password=hashed_password.encode("ascii"),
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Bcrypt hashes are always migrated to the default hasher."""
+        return True
+
+
+class _Argon2Hasher:
+    """Hash and verify passwords with Argon2id."""
+
+    prefix = "$argon2"
+
+    def __init__(self) -> None:
+        """Initialize the Argon2id parameters."""
+        self._hasher = PasswordHasher(
+            time_cost=_TIME_COST, memory_cost=_MEMORY_COST, parallelism=1
+        )
+
+    def hash(self, password: str) -> str:
+        """Hash a plaintext password with Argon2id."""
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a plaintext password against an Argon2 hash."""
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHash):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check if the hash was made with outdated parameters."""
+        return self._hasher.check_needs_rehash(hashed_password)
+
+
+_HASHER = _Argon2Hasher()
+_HASHERS = (_HASHER, _BcryptHasher())
+
+# Checked against when the user is unknown, so that failed logins take as
+# long whether or not the email is registered.
+_DUMMY_HASH = _HASHER.hash("dummy password")
+
+
+def _hasher_for(
+    hashed_password: str,
+) -> Union[_Argon2Hasher, _BcryptHasher, None]:
+    """Return the hasher able to verify the given hash, if any."""
+    for hasher in _HASHERS:
+        if hashed_password.startswith(hasher.prefix):
+            return hasher
+    return None
+
+
+# Password hashing is CPU bound, but argon2-cffi and bcrypt release the GIL
+# while hashing, so a thread pool runs hashes on several cores at once. The
+# semaphore caps in-flight jobs at the pool size to keep the queue bounded.
+_POOL_SIZE = int(getenv("HASH_POOL_SIZE", str(cpu_count() or 1)))
+_POOL = ThreadPoolExecutor(max_workers=_POOL_SIZE)
+_POOL_SLOTS = BoundedSemaphore(_POOL_SIZE)
+
+
+def _run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """Run `func` in the hashing pool and wait for its result."""
+    with _POOL_SLOTS:
+        return _POOL.submit(func, *args).result()
+
+
+def _hash(password: str) -> str:
+    """Hash a plaintext password with the default hasher."""
+    return _HASHER.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    """Check a plaintext password against a hash of any known format."""
+    hasher = _hasher_for(hashed_password)
+    if hasher is None:
+        return False
+    return hasher.verify(password, hashed_password)
+
 
 def _hash_password(password: str) -> bytes:
-    """Hash plaintext passwords."""
-    return bcrypt.hashpw(password=password.encode(), salt=bcrypt.gensalt())
+    """Hash plaintext passwords.
+
+    Auth stores hashes as `str` and calls `_hash` through the pool itself;
+    this bytes-returning form is kept for the project's public interface.
+    """
+    return _run_in_pool(_hash, password).encode("ascii")
+
+
+class SessionUser(NamedTuple):
+    """The fields of a logged in user needed by session endpoints."""
+
+    id: int
+    email: str
 
 
 class Auth:
@@ -24,6 +140,29 @@ class Auth:
     def __init__(self):
         """Initialize the Auth object."""
         self._db = DB()
+        # session ID -> SessionUser, and user ID -> session ID so a session
+        # can be evicted knowing only its owner.
+        self._session_cache = TTLCache(maxsize=10_000, ttl=60)
+        self._user_sessions = TTLCache(maxsize=10_000, ttl=60)
+        # Bumped whenever a session changes, so that a cache fill which read
+        # the database before the change is dropped instead of stored.
+        self._session_generation = 0
+        self._cache_lock = Lock()
+
+    def _forget_session(self, user_id: int) -> None:
+        """Evict the cached session of a user, if any.
+
+        Must be called after the session change is committed.
+        """
+        with self._cache_lock:
+            self._session_generation += 1
+            session_id = self._user_sessions.pop(user_id, None)
+            if session_id is not None:
+                self._session_cache.pop(session_id, None)
+
+    def remove_db_session(self) -> None:
+        """Release the database session of the current thread."""
+        self._db.remove_session()
 
     def register_user(self, email: str, password: str) -> User:
         """Register a new user with the provided email and password.
@@ -44,19 +183,21 @@ class Auth:
         if not password:
             raise ValueError("password missing")
 
+        hashed_password = _run_in_pool(_hash, password)
         try:
-            self._db.find_user_by(email=email)
-        except NoResultFound:
-            pass
-        else:
-            raise ValueError(f"User {email} already exists")
-
-        hashed_password = _hash_password(password=password).decode()
-        return self._db.add_user(email=email, hashed_password=hashed_password)
+            return self._db.add_user(
+                email=email, hashed_password=hashed_password
+            )
+        except IntegrityError as err:
+            raise ValueError(f"User {email} already exists") from err
 
     def valid_login(self, email: str, password: str) -> bool:
         """Validate user login credentials.
 
+        Hashes made by a legacy hasher (bcrypt) or with outdated parameters
+        are replaced by a fresh hash from the default hasher upon a
+        successful login.
+
         Args:
             email (str): The email address of the user attempting to log in.
             password (str): The plaintext password of the user attempting to
@@ -68,17 +209,25 @@ class Auth:
         try:
             db_user = self._db.find_user_by(email=email)
         except NoResultFound:
+            _run_in_pool(_verify, password, _DUMMY_HASH)
             return False
 
-        return bcrypt.checkpw(
-            password=password.encode(),
-            hashed_password=db_user.hashed_password.encode(),
-        )
+        if not _run_in_pool(_verify, password, db_user.hashed_password):
+            return False
+
+        hasher = _hasher_for(db_user.hashed_password)
+        if hasher.needs_rehash(db_user.hashed_password):
+            self._db.update_user(
+                user_id=db_user.id,
+                hashed_password=_run_in_pool(_hash, password),
+            )
+
+        return True
 
     @staticmethod
     def _generate_uuid() -> str:
-        """Generate UUIDs."""
-        return str(uuid.uuid4())
+        """Generate UUIDs as 32-character hex strings."""
+        return uuid.uuid4().hex
 
     def create_session(self, email: str) -> Union[str, None]:
         """Create session for a user after successful login.
@@ -95,36 +244,49 @@ class Auth:
         except NoResultFound:
             return None
 
-        self._db.update_user(
-            user_id=db_user.id, session_id=self._generate_uuid()
-        )
+        session_id = self._generate_uuid()
+        self._db.update_user(user_id=db_user.id, session_id=session_id)
+        self._forget_session(user_id=db_user.id)
 
-        return db_user.session_id
+        return session_id
 
-    def get_user_from_session_id(self, session_id: str) -> Union[User, None]:
-        """Get the user object related with a session ID.
+    def get_user_from_session_id(
+        self, session_id: str
+    ) -> Union[SessionUser, None]:
+        """Get the user related with a session ID.
 
         The user whose session ID is presented will be returned if found in
-        the database. Otherwise, nothing (`None`) is returned as the user
-        was not found in the database.
-
+        the session cache or the database. Otherwise, nothing (`None`) is
+        returned as the user was not found in the database.
 
         Args:
             session_id (str): The session ID of the user searched for.
 
         Returns:
-            User | None: The user whose `session_id` was received if found,
-            None otherwise.
+            SessionUser | None: The user whose `session_id` was received if
+            found, None otherwise.
         """
         if not session_id:
             return None
 
+        with self._cache_lock:
+            session_user = self._session_cache.get(session_id)
+            generation = self._session_generation
+        if session_user is not None:
+            return session_user
+
         try:
             db_user = self._db.find_user_by(session_id=session_id)
         except NoResultFound:
             return None
 
-        return db_user
+        session_user = SessionUser(id=db_user.id, email=db_user.email)
+        with self._cache_lock:
+            if generation == self._session_generation:
+                self._session_cache[session_id] = session_user
+                self._user_sessions[db_user.id] = session_id
+
+        return session_user
 
     def destroy_session(self, user_id: int) -> None:
         """Destroy a user session.
@@ -136,11 +298,10 @@ class Auth:
             user_id (int): The ID of the user whose session is to be destroyed.
         """
         try:
-            self._db.find_user_by(id=user_id)
+            self._db.update_user(user_id=user_id, session_id=None)
         except NoResultFound:
             raise ValueError(f"{user_id} is not a valid user ID.")
-
-        self._db.update_user(user_id=user_id, session_id=None)
+        self._forget_session(user_id=user_id)
 
     def get_reset_password_token(self, email: str) -> str:
         """Return the token for user password reset."""
@@ -164,7 +325,7 @@ class Auth:
         except NoResultFound:
             raise ValueError("Reset token is invalid or expired")
 
-        hashed_password = _hash_password(password).decode()
+        hashed_password = _run_in_pool(_hash, password)
         self._db.update_user(
             user_id=db_user.id,
             hashed_password=hashed_password,
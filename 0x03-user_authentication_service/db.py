@@ -3,15 +3,24 @@
 """DB module."""
 from os import getenv
 
-from sqlalchemy import create_engine
-from sqlalchemy.exc import InvalidRequestError
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, create_engine, event, select, update
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
 # noinspection PyCompatibility
 from user import Base, User
 
+_USER_COLUMNS = frozenset(column.name for column in User.__table__.columns)
+
+# Prebuilt statements for the single-field lookups done on every request.
+_FIND_USER_BY = {
+    column: select(User).where(getattr(User, column) == bindparam(column))
+    for column in ("id", "email", "session_id", "reset_token")
+}
+
 
 class DB:
     """DB class."""
@@ -20,25 +29,57 @@ class DB:
         """Initialize a new DB instance."""
         echo = getenv("ECHO") == "True"
 
-        self._engine = create_engine("sqlite:///a.db", echo=echo)
-        Base.metadata.drop_all(self._engine)
+        self._engine = create_engine(
+            "sqlite:///a.db",
+            echo=echo,
+            future=True,
+            query_cache_size=1200,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+        )
+        event.listen(self._engine, "connect", self._set_sqlite_pragmas)
+        if getenv("DB_RESET") == "True":
+            Base.metadata.drop_all(self._engine)
         Base.metadata.create_all(self._engine)
-        self.__session = None
+        # create_all skips existing tables, so a users table made before the
+        # indexes (including UNIQUE(email)) were declared lacks them.
+        for index in User.__table__.indexes:
+            index.create(bind=self._engine, checkfirst=True)
+        self.__session = scoped_session(
+            sessionmaker(
+                bind=self._engine, future=True, expire_on_commit=False
+            )
+        )
+
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Configure every new SQLite connection.
+
+        WAL lets readers run alongside a writer, and `synchronous=NORMAL`
+        only syncs the WAL file on checkpoints instead of on every commit.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 
     @property
     def _session(self) -> Session:
-        """Memoized session object."""
-        if self.__session is None:
-            db_session = sessionmaker(bind=self._engine)
-            self.__session = db_session()
-        return self.__session
+        """Session object of the current thread."""
+        return self.__session()
+
+    def remove_session(self) -> None:
+        """Close and discard the session of the current thread."""
+        self.__session.remove()
 
     @staticmethod
     def _valid_attributes(**kwargs) -> bool:
         """Validate keyword arguments against User class attributes.
 
-        Check if the provided keyword arguments are valid attributes of the
-        User class.
+        Check if the provided keyword arguments are columns of the User
+        table.
 
         Args:
             **kwargs: Arbitrary keyword arguments representing user attributes.
@@ -47,13 +88,7 @@ class DB:
             bool: True if all provided keys are valid User attributes,
             False otherwise.
         """
-        user_dict_keys = set(User.__dict__.keys())
-        kw_dict_keys = set(kwargs.keys())
-
-        if not kw_dict_keys.issubset(user_dict_keys):
-            return False
-
-        return True
+        return _USER_COLUMNS.issuperset(kwargs)
 
     def add_user(self, email: str, hashed_password: str) -> User:
         """Create and save a new user to the database.
@@ -62,13 +97,20 @@ class DB:
             email (str): The email of the user.
             hashed_password (str): A secure and safe password for the user.
 
+        Raises:
+            IntegrityError: If a user with the same email already exists.
+
         Returns:
             User: A new user object is returned on success.
         """
         db_user = User(email=email, hashed_password=hashed_password)
         self._session.add(db_user)
 
-        self._session.commit()
+        try:
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            raise
         return db_user
 
     def find_user_by(self, **kwargs) -> User:
@@ -91,7 +133,13 @@ class DB:
         if not self._valid_attributes(**kwargs):
             raise InvalidRequestError("Invalid search parameters provided.")
 
-        db_user = self._session.query(User).filter_by(**kwargs).first()
+        stmt, params = None, kwargs
+        if len(kwargs) == 1:
+            stmt = _FIND_USER_BY.get(next(iter(kwargs)))
+        if stmt is None:
+            stmt, params = select(User).filter_by(**kwargs), {}
+
+        db_user = self._session.execute(stmt, params).scalars().first()
         if not db_user:
             raise NoResultFound("No user found with the given parameters.")
 
@@ -107,13 +155,20 @@ class DB:
 
         Raises:
             ValueError: If any provided key is not a valid user attribute.
+            NoResultFound: If no user has the given ID.
         """
         if not self._valid_attributes(**kwargs):
             raise ValueError("Unrecognized arguments for User.")
 
-        db_user = self.find_user_by(id=user_id)
-        for key, value in kwargs.items():
-            setattr(db_user, key, value)
+        if not kwargs:
+            self.find_user_by(id=user_id)
+            return
+
+        result = self._session.execute(
+            update(User).where(User.id == user_id).values(**kwargs)
+        )
+        if result.rowcount == 0:
+            self._session.rollback()
+            raise NoResultFound("No user found with the given parameters.")
 
-        self._session.add(db_user)
         self._session.commit()
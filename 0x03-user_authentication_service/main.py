@@ -2,15 +2,21 @@
 
 """Integration testing."""
 import uuid
+from http.cookiejar import DefaultCookiePolicy
 
 import requests
 
 API_URL = "http://localhost:5000"
 
+# share one connection pool so requests reuse keep-alive connections, but
+# never store cookies: each check passes the session cookie it means to use.
+SESSION = requests.Session()
+SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
 
 def register_user(email: str, password: str) -> None:
     """Test the User registration endpoint."""
-    response = requests.post(
+    response = SESSION.post(
         url=f"{API_URL}/users",
         data={"email": email, "password": password},
     )
@@ -24,7 +30,7 @@ def register_user(email: str, password: str) -> None:
 
 def log_in_wrong_password(email: str, password: str) -> None:
     """Test the login endpoint with invalid credentials."""
-    response = requests.post(
+    response = SESSION.post(
         url=f"{API_URL}/sessions", data={"email": email, "password": password}
     )
 
@@ -36,7 +42,7 @@ def log_in_wrong_password(email: str, password: str) -> None:
 
 def log_in(email: str, password: str) -> str:
     """Test the login endpoint with valid credentials."""
-    response = requests.post(
+    response = SESSION.post(
         url=f"{API_URL}/sessions", data={"email": email, "password": password}
     )
 
@@ -47,7 +53,7 @@ def log_in(email: str, password: str) -> str:
 
     # use the token for something real quick
     session_id = response.cookies.get("session_id")
-    profile_response = requests.get(
+    profile_response = SESSION.get(
         url=f"{API_URL}/profile",
         cookies={"session_id": session_id},
     )
@@ -61,14 +67,14 @@ def log_in(email: str, password: str) -> str:
 
 def profile_unlogged() -> None:
     """Test the /profile endpoint without authentication."""
-    response = requests.get(url=f"{API_URL}/profile")
+    response = SESSION.get(url=f"{API_URL}/profile")
 
     assert response.status_code == 403
 
 
 def profile_logged(session_id: str) -> None:
     """Test the /profile endpoint with authenticated user."""
-    response = requests.get(
+    response = SESSION.get(
         url=f"{API_URL}/profile", cookies={"session_id": session_id}
     )
 
@@ -78,7 +84,7 @@ def profile_logged(session_id: str) -> None:
 
 def log_out(session_id: str) -> None:
     """Test the logout endpoint."""
-    response = requests.delete(
+    response = SESSION.delete(
         url=f"{API_URL}/sessions",
         cookies={"session_id": session_id},
         allow_redirects=False,
@@ -91,13 +97,13 @@ def log_out(session_id: str) -> None:
     assert next_url == "/"
 
     # now let's manually follow through to end of the redirection.
-    next_response = requests.get(url=f"{API_URL}{next_url}")
+    next_response = SESSION.get(url=f"{API_URL}{next_url}")
     assert next_response.status_code == 200
 
 
 def reset_password_token(email: str) -> str:
     """Test password reset token endpoint."""
-    response = requests.post(
+    response = SESSION.post(
         url=f"{API_URL}/reset_password", data={"email": email}
     )
 
@@ -110,15 +116,15 @@ def reset_password_token(email: str) -> str:
     assert token is not None
 
     # try converting token to a UUID, a valid token won't break the code
-    uuid_token = uuid.UUID(token)
+    uuid_token = uuid.UUID(hex=token)
 
-    assert token == str(uuid_token)
+    assert token == uuid_token.hex
     return token
 
 
 def update_password(email: str, reset_token: str, new_password: str) -> None:
     """Test the password update endpoint."""
-    response = requests.put(
+    response = SESSION.put(
         url=f"{API_URL}/reset_password",
         data={
             "email": email,
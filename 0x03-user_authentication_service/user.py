@@ -14,7 +14,8 @@ class User(Base):
     __tablename__ = "users"
 
     id: int = Column(Integer, primary_key=True)
-    email: str = Column(String(250), nullable=False)
+    email: str = Column(String(250), nullable=False, index=True, unique=True)
     hashed_password: str = Column(String(250), nullable=False)
-    session_id: str = Column(String(250), nullable=True)
-    reset_token: str = Column(String(250), nullable=True)
+    # session IDs and reset tokens are UUIDs
+    session_id: str = Column(String(36), nullable=True, index=True)
+    reset_token: str = Column(String(36), nullable=True, index=True)
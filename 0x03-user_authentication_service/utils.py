@@ -2,22 +2,13 @@
 
 """Utilities module."""
 
-from typing import Any, Tuple, Union
+from typing import AbstractSet, Any, Tuple, Union
 
 from flask import request
 
 
-def _check_form_data_field_existence(*, expected_fields: set):
-    """Verify that the expected fields are found in the request body."""
-    if not request.form:
-        raise ValueError({"expected_fields": list(expected_fields)})
-    for field in expected_fields:
-        if not request.form.get(field):
-            raise ValueError(f"{field} missing")
-
-
 def request_body_provided(
-    *, expected_fields: set
+    *, expected_fields: AbstractSet[str]
 ) -> Union[Tuple[bool, Any], Tuple[bool, None]]:
     """Validate that all fields required for request body is provided.
 
@@ -29,15 +20,21 @@ def request_body_provided(
     set to `None` and success is to `True`.
 
     Args:
-        expected_fields (set): The field(s) expected to be in the request body.
+        expected_fields (AbstractSet[str]): The field(s) expected to be in
+         the request body.
 
     Returns:
         `False` and an error message if an error occurred. Otherwise,
         `True` with error message set to `None`.
     """
-    try:
-        _check_form_data_field_existence(expected_fields=expected_fields)
-    except ValueError as err:
-        return False, err.args[0]
+    form = request.form
+    if not form:
+        return False, {"expected_fields": list(expected_fields)}
+
+    missing = next(
+        (field for field in expected_fields if not form.get(field)), None
+    )
+    if missing is not None:
+        return False, f"{missing} missing"
 
     return True, None
@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+
+"""WSGI entry point for production servers."""
+
+from app import app  # noqa: F401